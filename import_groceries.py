@@ -5,274 +5,677 @@ via HTTP REST endpoints.
 
 Mapping:
 - Recipes in JSON -> Recipes in system
-- Items in JSON -> Ingredients in system  
+- Items in JSON -> Ingredients in system
 - Category in JSON -> Store Location in system
 
-The script ensures no duplicates by tracking created entities and reusing them.
+The whole file is planned up front so that every store location and ingredient
+is created exactly once. Each phase (store locations, ingredients, recipes) is
+then run by a bounded pool of workers so that the latency of independent
+requests overlaps.
 """
 
+import argparse
 import json
+import logging
+import queue
+import random
 import requests
+from requests.adapters import HTTPAdapter
+from urllib.parse import quote
+from urllib3.exceptions import MaxRetryError, ReadTimeoutError
+from urllib3.util.retry import Retry
 import sys
-from typing import Dict, Set, Optional
-import time
+import threading
+from logging.handlers import QueueHandler, QueueListener
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from types import MappingProxyType
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+try:
+    import ijson  # Optional: stream-parses the input instead of loading it whole
+except ImportError:
+    ijson = None
+
+try:
+    import orjson  # Optional: faster JSON encoding/decoding of request and response bodies
+except ImportError:
+    orjson = None
+
+if orjson is not None:
+    _dumps = orjson.dumps
+    _loads = orjson.loads
+else:
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj).encode('utf-8')
+
+    _loads = json.loads
+
+logger = logging.getLogger(__name__)
+
+# Number of requests kept in flight by the worker pool
+MAX_CONCURRENT = 5
+
+# Number of ingredients created per bulk request
+INGREDIENT_BATCH_SIZE = 25
+
+# Map category names to more descriptive store location names
+_LOCATION_MAPPING = MappingProxyType({
+    "Produce": "Produce Section",
+    "Meat": "Meat Department",
+    "Dairy": "Dairy Section",
+    "Cheese": "Cheese Counter",
+    "Middle": "Center Aisles",
+    "Bakery": "Bakery Department",
+    "Deli": "Deli Counter",
+    "Frozen Food": "Frozen Foods",
+    "": "General Store"  # Handle empty categories
+})
+
+_LOCATION_DESCRIPTIONS = MappingProxyType({
+    category: f"Store location for {category.lower()} items" for category in _LOCATION_MAPPING
+})
+
+_CATEGORIES_BY_LOCATION = MappingProxyType({
+    location_name: category for category, location_name in _LOCATION_MAPPING.items()
+})
+
+# Returned by make_request when the server answers 409 Conflict, i.e. the
+# entity or relationship already exists. Falsy and read-only like an empty result.
+ALREADY_EXISTS = MappingProxyType({})
+
+# Seconds to wait for a connection to be established / for the server to respond
+CONNECT_TIMEOUT = 3.05
+READ_TIMEOUT = 10
+
+# Extra seconds to wait for a bulk ingredient response per ingredient in the
+# batch; the server creates them one after another, each with an embedding call
+BULK_READ_TIMEOUT_PER_INGREDIENT = 2
+
+def _iter_recipes(json_file_path: str) -> Iterator[dict]:
+    """Yield the recipes in the JSON file one at a time"""
+    if ijson is not None:
+        with open(json_file_path, 'rb') as f:
+            yield from ijson.items(f, 'recipes.item')
+    else:
+        with open(json_file_path, 'rb') as f:
+            yield from _loads(f.read()).get('recipes', [])
+
+class JitteredRetry(Retry):
+    """Retry policy whose exponential backoff is randomized so that concurrent
+    workers don't all retry against the server at the same moment"""
+
+    # The server turned the request away without acting on it, so even a
+    # (non-idempotent) create can safely be sent again
+    REJECTED_STATUS_CODES = frozenset([429, 503])
+
+    def get_backoff_time(self) -> float:
+        return super().get_backoff_time() * random.uniform(0.5, 1.5)
+
+    def is_retry(self, method: str, status_code: int, has_retry_after: bool = False) -> bool:
+        if status_code in self.REJECTED_STATUS_CODES and status_code in (self.status_forcelist or ()):
+            return True
+        return super().is_retry(method, status_code, has_retry_after)
 
 class FoodChainImporter:
-    def __init__(self, base_url: str = "http://localhost:8080"):
+    def __init__(self, base_url: str = "http://localhost:8080", max_concurrent: int = MAX_CONCURRENT,
+                 connect_timeout: float = CONNECT_TIMEOUT, read_timeout: float = READ_TIMEOUT):
         self.base_url = base_url.rstrip('/')
         self.session = requests.Session()
-        
-        # Track created entities to avoid duplicates
-        self.store_locations: Dict[str, str] = {}  # name -> id
-        self.ingredients: Dict[str, str] = {}      # name -> id
-        self.recipes: Dict[str, str] = {}          # name -> id
-        
-        # Track processed items
-        self.processed_store_locations: Set[str] = set()
-        self.processed_ingredients: Set[str] = set()
-        self.processed_recipes: Set[str] = set()
-
-    def make_request(self, method: str, endpoint: str, data: dict = None, retries: int = 3) -> Optional[dict]:
-        """Make HTTP request with retry logic"""
+        self.max_concurrent = max_concurrent
+        self.timeout = (connect_timeout, read_timeout)
+        self.timed_out_requests = 0
+        self._timeouts_lock = threading.Lock()
+        # Ingredients and relationships that could not be created; failed
+        # recipes are counted by import_data()
+        self.failed_ingredients = 0
+        self.failed_relationships = 0
+        self._failures_lock = threading.Lock()
+
+        # Keep connections alive and pooled so every worker reuses its socket
+        # instead of paying a new TCP (and TLS) handshake per request. The pool
+        # holds at least one connection per worker; HTTP/2 multiplexing isn't
+        # used because the service (Ktor/Netty) only speaks HTTP/2 over TLS
+        # and requests/urllib3 are HTTP/1.1 clients.
+        retry = JitteredRetry(
+            total=5,
+            backoff_factor=0.3,
+            status_forcelist=[429, 500, 502, 503, 504],
+            # Only idempotent methods are retried on read errors (e.g. a read
+            # timeout) and on any listed status. A POST that got no answer or a
+            # 500/502/504 (e.g. from a gateway) may still have been carried out,
+            # and re-sending a create would create duplicates, so it's only
+            # retried on REJECTED_STATUS_CODES
+            allowed_methods=frozenset(['GET', 'PUT']),
+            respect_retry_after_header=True,
+            raise_on_status=False  # Hand the final response back so it can be reported
+        )
+        pool_size = max(32, max_concurrent)
+        adapter = HTTPAdapter(pool_connections=32, pool_maxsize=pool_size, pool_block=False, max_retries=retry)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.session.headers.update({
+            'Connection': 'keep-alive',
+            'Content-Type': 'application/json'
+        })
+
+        # Track created entities to avoid duplicates. The first caller for a
+        # name stores a future and creates the entity; concurrent callers for
+        # the same name wait on that future instead of creating it again.
+        # A future resolving to None means the creation failed.
+        self.store_locations: Dict[str, Future] = {}  # name -> future id
+        self.ingredients: Dict[str, Future] = {}      # name -> future id
+        self.recipes: Dict[str, Future] = {}          # name -> future id
+        self._claims_lock = threading.Lock()
+
+        # Store location ID per category, filled in once phase 1 of the import is done
+        self.category_to_location_id: Dict[str, str] = {}
+
+        # Number of entities per type found on the server by load_existing()
+        self.preexisting: Dict[str, int] = {}
+        # Ingredients found by load_existing() that aren't linked to a store
+        # location, e.g. because the link failed in an earlier run
+        self.unlinked_ingredients: Dict[str, str] = {}  # name -> id
+
+    def _claim(self, cache: Dict[str, Future], names: Iterable[str]) -> Tuple[Dict[str, Future], Dict[str, Future]]:
+        """Split names into those the caller must create (a new future is stored
+        for each) and those already created or in flight elsewhere"""
+        owned: Dict[str, Future] = {}
+        existing: Dict[str, Future] = {}
+        with self._claims_lock:
+            for name in names:
+                future = cache.get(name)
+                if future is None:
+                    owned[name] = cache[name] = Future()
+                else:
+                    existing[name] = future
+        return owned, existing
+
+    def _ingredients_failed(self, count: int = 1):
+        with self._failures_lock:
+            self.failed_ingredients += count
+
+    def _relationships_failed(self, count: int = 1):
+        with self._failures_lock:
+            self.failed_relationships += count
+
+    @staticmethod
+    def _created_count(cache: Dict[str, Future]) -> int:
+        """Number of entities in the cache that were created successfully"""
+        return sum(1 for future in cache.values() if future.done() and future.result() is not None)
+
+    def load_existing(self) -> bool:
+        """Seed the caches with the entities that already exist on the server,
+        so that re-running an (interrupted) import doesn't create them again.
+        Returns False if they could not be fetched"""
+        for entity_type, cache in (('StoreLocation', self.store_locations),
+                                   ('Ingredient', self.ingredients),
+                                   ('Recipe', self.recipes)):
+            result = self.make_request('GET', f'/api/v1/entities/search?type={entity_type}')
+            if not isinstance(result, list):
+                logger.error("✗ Could not fetch existing %s entities", entity_type)
+                return False
+
+            seeded = 0
+            for entity in result:
+                name = entity['name']
+                if entity_type == 'StoreLocation':
+                    name = _CATEGORIES_BY_LOCATION.get(name, name)
+                if name not in cache:
+                    cache[name] = Future()
+                    cache[name].set_result(entity['id'])
+                    seeded += 1
+                    # An ingredient's only outgoing relationship is to its store
+                    # location; the server omits relatedEntitiesCount when it's 0
+                    if entity_type == 'Ingredient' and not entity.get('relatedEntitiesCount'):
+                        self.unlinked_ingredients[name] = entity['id']
+            self.preexisting[entity_type] = seeded
+        return True
+
+    def find_existing_id(self, entity_type: str, name: str) -> Optional[str]:
+        """Look up the ID of an existing entity by type and exact name"""
+        result = self.make_request('GET', f'/api/v1/entities/search?name={quote(name)}')
+        if not isinstance(result, list):
+            return None
+        for entity in result:
+            if entity.get('type') == entity_type:
+                return entity['id']
+        return None
+
+    @staticmethod
+    def _is_timeout(error: requests.exceptions.RequestException) -> bool:
+        """Whether the request failed because the server didn't answer in time"""
+        if isinstance(error, requests.exceptions.Timeout):
+            return True
+        # Once the adapter has run out of retries for a read timeout, requests
+        # raises a ConnectionError wrapping the MaxRetryError instead of ReadTimeout
+        reason = error.args[0] if error.args else None
+        return isinstance(reason, MaxRetryError) and isinstance(reason.reason, ReadTimeoutError)
+
+    def make_request(self, method: str, endpoint: str, data: dict = None,
+                     read_timeout: Optional[float] = None) -> Optional[Union[dict, list]]:
+        """Make HTTP request; transient failures are retried by the session's adapter"""
         url = f"{self.base_url}{endpoint}"
-        
-        for attempt in range(retries):
+        connect_timeout, default_read_timeout = self.timeout
+        timeout = (connect_timeout, read_timeout if read_timeout is not None else default_read_timeout)
+
+        try:
+            # The body is pre-encoded (the session already sends the JSON
+            # Content-Type) instead of letting requests run json.dumps
+            body = _dumps(data) if data is not None else None
+            response = self.session.request(method.upper(), url, data=body, timeout=timeout)
+        except requests.exceptions.RequestException as e:
+            if not self._is_timeout(e):
+                logger.warning("Request failed for %s: %s", endpoint, e)
+                return None
+            # Connect timeouts (and read timeouts of GETs) have already been
+            # retried by the adapter; a POST's read timeout isn't retried since
+            # the server may still act on the request
+            with self._timeouts_lock:
+                self.timed_out_requests += 1
+            logger.warning("Request timed out for %s: %s", endpoint, e)
+            return None
+
+        if response.status_code in [200, 201]:
+            if not response.content:
+                return {}
             try:
-                if method.upper() == 'GET':
-                    response = self.session.get(url)
-                elif method.upper() == 'POST':
-                    response = self.session.post(url, json=data)
-                elif method.upper() == 'PUT':
-                    response = self.session.put(url, json=data)
-                else:
-                    raise ValueError(f"Unsupported HTTP method: {method}")
-                
-                if response.status_code in [200, 201]:
-                    return response.json() if response.content else {}
-                elif response.status_code == 409:
-                    print(f"Conflict (409) for {endpoint}: Entity may already exist")
-                    return None
-                else:
-                    print(f"HTTP {response.status_code} for {endpoint}: {response.text}")
-                    if attempt < retries - 1:
-                        time.sleep(1)  # Wait before retry
-                        continue
-                    return None
-                    
-            except requests.exceptions.RequestException as e:
-                print(f"Request failed (attempt {attempt + 1}): {e}")
-                if attempt < retries - 1:
-                    time.sleep(1)
-                    continue
+                return _loads(response.content)
+            except ValueError as e:
+                # e.g. an HTML error page from a proxy in front of the service
+                logger.warning("Invalid JSON in response for %s: %s", endpoint, e)
                 return None
-        
-        return None
+        elif response.status_code == 409:
+            logger.debug("Conflict (409) for %s: already exists", endpoint)
+            return ALREADY_EXISTS
+        else:
+            logger.warning("HTTP %s for %s: %s", response.status_code, endpoint, response.text)
+            return None
 
     def create_store_location(self, category_name: str) -> Optional[str]:
         """Create a store location and return its ID"""
-        if category_name in self.processed_store_locations:
-            location_id = self.store_locations.get(category_name)
-            if location_id:
-                return location_id
-            else:
-                print(f"⚠ Store location '{category_name}' marked as processed but ID not found")
-                # Continue to create the store location
-        
-        # Map category names to more descriptive store location names
-        location_mapping = {
-            "Produce": "Produce Section",
-            "Meat": "Meat Department",
-            "Dairy": "Dairy Section",
-            "Cheese": "Cheese Counter",
-            "Middle": "Center Aisles",
-            "Bakery": "Bakery Department",
-            "Deli": "Deli Counter",
-            "Frozen Food": "Frozen Foods",
-            "": "General Store"  # Handle empty categories
-        }
-
         # Handle empty or None categories
         if not category_name or category_name.strip() == "":
             category_name = ""
-        
-        location_name = location_mapping.get(category_name, category_name)
-        
+
+        owned, existing = self._claim(self.store_locations, [category_name])
+        if existing:
+            return existing[category_name].result()
+
+        location_id = None
+        try:
+            location_id = self._post_store_location(category_name)
+        finally:
+            owned[category_name].set_result(location_id)
+        return location_id
+
+    def _post_store_location(self, category_name: str) -> Optional[str]:
+        """POST a new store location and return its ID"""
+        location_name = _LOCATION_MAPPING.get(category_name, category_name)
+        description = _LOCATION_DESCRIPTIONS.get(category_name)
+        if description is None:
+            description = f"Store location for {category_name.lower()} items"
+
         store_location_data = {
             "name": location_name,
-            "description": f"Store location for {category_name.lower()} items"
+            "description": description
         }
-        
-        print(f"Creating store location: {location_name}")
+
+        logger.debug("Creating store location: %s", location_name)
         result = self.make_request('POST', '/api/v1/food-chain/store-locations', store_location_data)
-        
-        if result and 'id' in result:
+
+        if result is ALREADY_EXISTS:
+            location_id = self.find_existing_id('StoreLocation', location_name)
+            if location_id is not None:
+                logger.info("✓ Store location '%s' already exists with ID: %s", location_name, location_id)
+                return location_id
+            logger.error("✗ Store location '%s' already exists but could not be looked up", location_name)
+            return None
+        elif result and 'id' in result:
             location_id = result['id']
-            self.store_locations[category_name] = location_id
-            self.processed_store_locations.add(category_name)
-            print(f"✓ Created store location '{location_name}' with ID: {location_id}")
+            logger.info("✓ Created store location '%s' with ID: %s", location_name, location_id)
             return location_id
         else:
-            print(f"✗ Failed to create store location: {location_name}")
+            logger.error("✗ Failed to create store location: %s", location_name)
             return None
 
-    def create_ingredient(self, item_name: str, category: str) -> Optional[str]:
-        """Create an ingredient and return its ID"""
-        if item_name in self.processed_ingredients:
-            ingredient_id = self.ingredients.get(item_name)
-            if ingredient_id:
-                return ingredient_id
-            else:
-                print(f"⚠ Ingredient '{item_name}' marked as processed but ID not found")
-                # Continue to create the ingredient
-        
-        # Ensure store location exists
-        store_location_id = self.create_store_location(category)
-        if not store_location_id:
-            print(f"✗ Cannot create ingredient '{item_name}' - store location creation failed")
-            return None
-        
-        ingredient_data = {
-            "name": item_name,
-            "purchaseFrequency": "Usually"  # Default value as per domain model
-        }
-        
-        print(f"Creating ingredient: {item_name}")
-        result = self.make_request('POST', '/api/v1/food-chain/ingredients', ingredient_data)
-        
-        if result and 'id' in result:
-            ingredient_id = result['id']
-            self.ingredients[item_name] = ingredient_id
-            self.processed_ingredients.add(item_name)
-            print(f"✓ Created ingredient '{item_name}' with ID: {ingredient_id}")
-            
-            # Create relationship between ingredient and store location
-            self.create_ingredient_store_relationship(ingredient_id, store_location_id)
-            return ingredient_id
+    def create_ingredients_bulk(self, items: Dict[str, str]) -> Dict[str, str]:
+        """Create the given ingredients (name -> store location ID) in a single bulk request and return name -> ID"""
+        owned, existing = self._claim(self.ingredients, items)
+
+        created: Dict[str, str] = {}
+        try:
+            if owned:
+                created = self._post_ingredients({item_name: items[item_name] for item_name in owned})
+        finally:
+            for item_name, future in owned.items():
+                future.set_result(created.get(item_name))
+
+        ingredient_ids: Dict[str, str] = {}
+        for item_name, future in {**owned, **existing}.items():
+            ingredient_id = future.result()
+            if ingredient_id is not None:
+                ingredient_ids[item_name] = ingredient_id
+        return ingredient_ids
+
+    def _post_ingredients(self, items: Dict[str, str]) -> Dict[str, str]:
+        """POST the given ingredients (name -> store location ID) to the bulk endpoint and return name -> ID"""
+        pending = [
+            {
+                "name": item_name,
+                "purchaseFrequency": "Usually",  # Default value as per domain model
+                "storeLocationId": store_location_id
+            }
+            for item_name, store_location_id in items.items()
+        ]
+
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Creating %d ingredients: %s", len(pending), ', '.join(data['name'] for data in pending))
+        read_timeout = self.timeout[1] + BULK_READ_TIMEOUT_PER_INGREDIENT * len(pending)
+        result = self.make_request('POST', '/api/v1/food-chain/ingredients/bulk', {"ingredients": pending},
+                                   read_timeout=read_timeout)
+
+        ingredient_ids: Dict[str, str] = {}
+        if result and 'ingredients' in result:
+            for created in result['ingredients']:
+                item_name = created['name']
+                ingredient_id = created['id']
+                ingredient_ids[item_name] = ingredient_id
+                logger.debug("✓ Created ingredient '%s' with ID: %s", item_name, ingredient_id)
+                if created.get('storeLocationId') is None:
+                    self._relationships_failed()
+                    logger.error("✗ Failed to create ingredient->store location relationship for '%s'", item_name)
+            for item_name in result.get('failedNames', []):
+                self._ingredients_failed()
+                logger.error("✗ Failed to create ingredient: %s", item_name)
         else:
-            print(f"✗ Failed to create ingredient: {item_name}")
-            return None
+            self._ingredients_failed(len(pending))
+            logger.error("✗ Failed to create ingredients: %s", ', '.join(data['name'] for data in pending))
 
-    def create_ingredient_store_relationship(self, ingredient_id: str, store_location_id: str):
-        """Create relationship between ingredient and store location"""
-        endpoint = f'/api/v1/food-chain/ingredients/{ingredient_id}/store-locations/{store_location_id}'
+        return ingredient_ids
 
+    def link_store_location(self, item_name: str, store_location_id: str) -> bool:
+        """Link an ingredient left without a store location by an earlier run to its store location"""
+        ingredient_id = self.unlinked_ingredients[item_name]
+        endpoint = f'/api/v1/food-chain/ingredients/{ingredient_id}/store-locations/{store_location_id}'
         result = self.make_request('POST', endpoint)
-        if result:
-            print(f"✓ Created ingredient->store location relationship")
-        else:
-            print(f"✗ Failed to create ingredient->store location relationship")
+        if result is None:
+            self._relationships_failed()
+            logger.error("✗ Failed to create ingredient->store location relationship for '%s'", item_name)
+            return False
 
-    def create_recipe(self, recipe_name: str, items: list) -> Optional[str]:
+        logger.debug("✓ Linked ingredient '%s' to store location %s", item_name, store_location_id)
+        return True
+
+    def create_recipe(self, recipe_name: str) -> Optional[str]:
         """Create a recipe and return its ID"""
-        if recipe_name in self.processed_recipes:
-            recipe_id = self.recipes.get(recipe_name)
-            if recipe_id:
-                print(f"✓ Recipe '{recipe_name}' already exists with ID: {recipe_id}")
-                return recipe_id
-            else:
-                print(f"⚠ Recipe '{recipe_name}' marked as processed but ID not found")
-                # Continue to create the recipe
-        
+        owned, existing = self._claim(self.recipes, [recipe_name])
+        if existing:
+            recipe_id = existing[recipe_name].result()
+            if recipe_id is not None:
+                logger.debug("✓ Recipe '%s' already exists with ID: %s", recipe_name, recipe_id)
+            return recipe_id
+
+        recipe_id = None
+        try:
+            recipe_id = self._post_recipe(recipe_name)
+        finally:
+            owned[recipe_name].set_result(recipe_id)
+        return recipe_id
+
+    def _post_recipe(self, recipe_name: str) -> Optional[str]:
+        """POST a new recipe and return its ID"""
         recipe_data = {
             "name": recipe_name,
             "description": f"Recipe for {recipe_name}"
         }
-        
-        print(f"Creating recipe: {recipe_name}")
+
+        logger.debug("Creating recipe: %s", recipe_name)
         result = self.make_request('POST', '/api/v1/food-chain/recipes', recipe_data)
-        
-        if result and 'id' in result:
+
+        if result is ALREADY_EXISTS:
+            recipe_id = self.find_existing_id('Recipe', recipe_name)
+            if recipe_id is not None:
+                logger.debug("✓ Recipe '%s' already exists with ID: %s", recipe_name, recipe_id)
+                return recipe_id
+            logger.error("✗ Recipe '%s' already exists but could not be looked up", recipe_name)
+            return None
+        elif result and 'id' in result:
             recipe_id = result['id']
-            self.recipes[recipe_name] = recipe_id
-            self.processed_recipes.add(recipe_name)
-            print(f"✓ Created recipe '{recipe_name}' with ID: {recipe_id}")
-            
-            # Create relationships between recipe and ingredients
-            self.create_recipe_ingredient_relationships(recipe_id, items)
+            logger.debug("✓ Created recipe '%s' with ID: %s", recipe_name, recipe_id)
             return recipe_id
         else:
-            print(f"✗ Failed to create recipe: {recipe_name}")
+            logger.error("✗ Failed to create recipe: %s", recipe_name)
             return None
 
-    def create_recipe_ingredient_relationships(self, recipe_id: str, items: list):
-        """Create relationships between recipe and its ingredients"""
-        for item in items:
-            item_name = item['name']
-            category = item['category']
-            
-            # Ensure ingredient exists
-            ingredient_id = self.create_ingredient(item_name, category)
-            if ingredient_id:
-                endpoint = f'/api/v1/food-chain/recipes/{recipe_id}/ingredients/{ingredient_id}'
-
-                result = self.make_request('POST', endpoint)
-                if result:
-                    print(f"✓ Created recipe->ingredient relationship: {recipe_id} -> {ingredient_id}")
-                else:
-                    print(f"✗ Failed to create recipe->ingredient relationship")
+    def create_recipe_ingredient_relationships(self, recipe_id: str, ingredient_names: List[str]):
+        """Create relationships between recipe and its (already created) ingredients"""
+        ingredient_ids = []
+        for item_name in ingredient_names:
+            future = self.ingredients.get(item_name)
+            ingredient_id = future.result() if future is not None else None
+            if ingredient_id is not None:
+                ingredient_ids.append(ingredient_id)
+            else:
+                self._relationships_failed()
+                logger.error("✗ Cannot link ingredient '%s' to recipe %s - ingredient was not created", item_name, recipe_id)
+
+        if not ingredient_ids:
+            return
+
+        endpoint = f'/api/v1/food-chain/recipes/{recipe_id}/ingredients/bulk'
+        result = self.make_request('POST', endpoint, {"ingredientIds": ingredient_ids})
+        if result is None:
+            self._relationships_failed(len(ingredient_ids))
+            logger.error("✗ Failed to create recipe->ingredient relationships for recipe %s", recipe_id)
+            return
+        if result is ALREADY_EXISTS:
+            logger.debug("✓ Recipe %s is already linked to its ingredients", recipe_id)
+            return
+
+        logger.debug("✓ Created %s recipe->ingredient relationships for recipe %s", result.get('created', 0), recipe_id)
+        for ingredient_id in result.get('failedIds', []):
+            self._relationships_failed()
+            logger.error("✗ Failed to create recipe->ingredient relationship: %s -> %s", recipe_id, ingredient_id)
+
+    def import_recipe(self, recipe_name: str, ingredient_names: List[str]) -> Optional[str]:
+        """Create a recipe, link it to its ingredients and return the recipe ID"""
+        logger.debug("Processing recipe: %s (%d items)", recipe_name, len(ingredient_names))
+        recipe_id = self.create_recipe(recipe_name)
+        if recipe_id is not None:
+            self.create_recipe_ingredient_relationships(recipe_id, ingredient_names)
+        return recipe_id
+
+    def _plan(self, recipes_in: Iterable[dict]) -> Tuple[List[str], Dict[str, str], List[Tuple[str, List[str]]]]:
+        """Walk the recipes once and collect the unique store locations (categories),
+        ingredients (name -> category) and recipes (name -> ingredient names) to create"""
+        unique_items: Dict[str, str] = {}
+        recipes: Dict[str, List[str]] = {}
+
+        for recipe in recipes_in:
+            recipe_name = recipe.get('name', '')
+            if recipe_name in recipes:
+                logger.warning("⚠ Skipping duplicate recipe '%s'", recipe_name)
+                continue
+
+            ingredient_names = []
+            for item in recipe.get('items', []):
+                item_name = item['name']
+                category = item.get('category') or ""
+                if category.strip() == "":
+                    category = ""  # Handle empty categories
+
+                # The first category seen for an ingredient wins
+                unique_items.setdefault(item_name, category)
+                ingredient_names.append(item_name)
+
+            recipes[recipe_name] = ingredient_names
+
+        # dict.fromkeys dedups while keeping first-seen order
+        unique_categories = list(dict.fromkeys(unique_items.values()))
+        return unique_categories, unique_items, list(recipes.items())
 
     def import_data(self, json_file_path: str):
         """Import all data from the JSON file"""
+        # Only the plan (names and categories) is kept in memory, not the
+        # parsed file
         try:
-            with open(json_file_path, 'r') as f:
-                data = json.load(f)
+            unique_categories, unique_items, recipes = self._plan(_iter_recipes(json_file_path))
         except Exception as e:
-            print(f"Error reading JSON file: {e}")
+            logger.error("Error reading JSON file: %s", e)
             return False
-        
-        recipes = data.get('recipes', [])
+
         total_recipes = len(recipes)
-        
-        print(f"Starting import of {total_recipes} recipes...")
-        print("=" * 60)
-        
+
+        logger.info("Starting import of %d store locations, %d ingredients and %d recipes (%d concurrent workers)...",
+                    len(unique_categories), len(unique_items), total_recipes, self.max_concurrent)
+        logger.info("=" * 60)
+
+        # Without the existing entities every one of them would be created again
+        if not self.load_existing():
+            logger.error("Aborting import: could not check which entities already exist")
+            return False
+        if any(self.preexisting.values()):
+            logger.info("Found %d store locations, %d ingredients and %d recipes from a previous import; reusing them",
+                        self.preexisting.get('StoreLocation', 0), self.preexisting.get('Ingredient', 0),
+                        self.preexisting.get('Recipe', 0))
+
         success_count = 0
-        for i, recipe in enumerate(recipes, 1):
-            recipe_name = recipe.get('name', '')
-            items = recipe.get('items', [])
-            
-            print(f"\n[{i}/{total_recipes}] Processing recipe: {recipe_name}")
-            print(f"  Items: {len(items)}")
-            
-            result = self.create_recipe(recipe_name, items)
-            if result is not None:
-                success_count += 1
-                print(f"✓ SUCCESS COUNT: {success_count}/{total_recipes}")
-            else:
-                print(f"✗ FAILED: Recipe '{recipe_name}' returned: {result}")
-                print(f"✗ SUCCESS COUNT: {success_count}/{total_recipes}")
-            
-            # Add small delay to avoid overwhelming the server
-            time.sleep(0.1)
-        
-        print("\n" + "=" * 60)
-        print(f"Import completed!")
-        print(f"Successfully imported: {success_count}/{total_recipes} recipes")
-        print(f"Store locations created: {len(self.processed_store_locations)}")
-        print(f"Ingredients created: {len(self.processed_ingredients)}")
-        
-        return success_count == total_recipes
+        # The pool keeps max_concurrent requests in flight; a worker picks up the
+        # next task as soon as its current one finishes.
+        with ThreadPoolExecutor(max_workers=self.max_concurrent) as executor:
+            # Phase 1: store locations
+            location_futures = {
+                executor.submit(self.create_store_location, category): category
+                for category in unique_categories
+            }
+            for future in as_completed(location_futures):
+                category = location_futures[future]
+                try:
+                    location_id = future.result()
+                except Exception as e:
+                    logger.error("✗ Error creating store location for category '%s': %s", category, e)
+                    continue
+                if location_id is not None:
+                    self.category_to_location_id[category] = location_id
+
+            # Phase 2: ingredients, in bulk batches, each already resolved to
+            # its store location ID
+            items: Dict[str, str] = {}
+            for item_name, category in unique_items.items():
+                store_location_id = self.category_to_location_id.get(category)
+                if store_location_id is None:
+                    self._ingredients_failed()
+                    logger.error("✗ Cannot create ingredient '%s' - store location creation failed", item_name)
+                    continue
+                items[item_name] = store_location_id
+
+            item_names = list(items)
+            batches = [
+                {item_name: items[item_name] for item_name in item_names[start:start + INGREDIENT_BATCH_SIZE]}
+                for start in range(0, len(item_names), INGREDIENT_BATCH_SIZE)
+            ]
+            batch_futures = {executor.submit(self.create_ingredients_bulk, batch): batch for batch in batches}
+            for future in as_completed(batch_futures):
+                try:
+                    future.result()
+                except Exception as e:
+                    # The batch's futures have been resolved to None
+                    failed = [item_name for item_name in batch_futures[future]
+                              if self.ingredients.get(item_name) is None or self.ingredients[item_name].result() is None]
+                    self._ingredients_failed(len(failed))
+                    logger.error("✗ Error creating ingredients %s: %s", ', '.join(failed), e)
+
+            # Relationships are created with MERGE, so re-sending a link that
+            # does exist after all is harmless
+            relink_futures = {
+                executor.submit(self.link_store_location, item_name, items[item_name]): item_name
+                for item_name in items if item_name in self.unlinked_ingredients
+            }
+            relinked = 0
+            for future in as_completed(relink_futures):
+                item_name = relink_futures[future]
+                try:
+                    relinked += future.result()
+                except Exception as e:
+                    self._relationships_failed()
+                    logger.error("✗ Error linking ingredient '%s' to its store location: %s", item_name, e)
+
+            # Phase 3: recipes and their ingredient relationships
+            futures = {
+                executor.submit(self.import_recipe, recipe_name, ingredient_names): recipe_name
+                for recipe_name, ingredient_names in recipes
+            }
+
+            for i, future in enumerate(as_completed(futures), 1):
+                recipe_name = futures[future]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    logger.error("✗ Error importing recipe '%s': %s", recipe_name, e)
+                    result = None
+
+                if result is not None:
+                    success_count += 1
+                    logger.info("[%d/%d] ✓ Imported recipe: %s (success count: %d)",
+                                i, total_recipes, recipe_name, success_count)
+                else:
+                    logger.error("[%d/%d] ✗ FAILED: Recipe '%s' returned: %s (success count: %d)",
+                                 i, total_recipes, recipe_name, result, success_count)
+
+        logger.info("\n" + "=" * 60)
+        logger.info("Import completed!")
+        logger.info("Successfully imported: %d/%d recipes", success_count, total_recipes)
+        logger.info("Store locations created: %d",
+                    self._created_count(self.store_locations) - self.preexisting.get('StoreLocation', 0))
+        logger.info("Ingredients created: %d",
+                    self._created_count(self.ingredients) - self.preexisting.get('Ingredient', 0))
+        if relink_futures:
+            logger.info("Ingredients re-linked to their store location: %d/%d", relinked, len(relink_futures))
+        if self.failed_ingredients:
+            logger.warning("Ingredients failed: %d", self.failed_ingredients)
+        if self.failed_relationships:
+            logger.warning("Relationships failed: %d", self.failed_relationships)
+        if self.timed_out_requests:
+            logger.warning("Requests timed out: %d", self.timed_out_requests)
+
+        # Anything left incomplete is picked up by running the import again
+        return (success_count == total_recipes and not self.failed_ingredients
+                and not self.failed_relationships and not self.timed_out_requests)
+
+def configure_logging(verbose: bool = False) -> QueueListener:
+    """Send log output to stdout through a queue so that workers never block
+    on console I/O; the returned listener must be stopped to flush it"""
+    log_queue = queue.SimpleQueue()
+    logging.basicConfig(level=logging.INFO, format='%(message)s', handlers=[QueueHandler(log_queue)])
+    logger.setLevel(logging.DEBUG if verbose else logging.INFO)
+    listener = QueueListener(log_queue, logging.StreamHandler(sys.stdout))
+    listener.start()
+    return listener
 
 def main():
-    if len(sys.argv) > 1:
-        base_url = sys.argv[1]
-    else:
-        base_url = "http://localhost:8080"
-    
-    print(f"Food Chain Data Importer")
-    print(f"Target service: {base_url}")
-    print(f"Source file: our_groceries.json")
-    print("=" * 60)
-    
+    parser = argparse.ArgumentParser(description="Import our_groceries.json into the food-chain service")
+    parser.add_argument('base_url', nargs='?', default="http://localhost:8080", help="URL of the food-chain service")
+    parser.add_argument('-v', '--verbose', action='store_true', help="log every entity and relationship created")
+    args = parser.parse_args()
+    base_url = args.base_url
+
+    listener = configure_logging(args.verbose)
+    logger.info("Food Chain Data Importer")
+    logger.info("Target service: %s", base_url)
+    logger.info("Source file: our_groceries.json")
+    logger.info("=" * 60)
+
     importer = FoodChainImporter(base_url)
-    success = importer.import_data('our_groceries.json')
-    
-    if success:
-        print("\n🎉 Import completed successfully!")
-        sys.exit(0)
-    else:
-        print("\n❌ Import completed with errors.")
-        sys.exit(1)
+    try:
+        success = importer.import_data('our_groceries.json')
+        if success:
+            logger.info("\n🎉 Import completed successfully!")
+        else:
+            logger.error("\n❌ Import completed with errors.")
+    finally:
+        listener.stop()
+
+    sys.exit(0 if success else 1)
 
 if __name__ == '__main__':
     main()
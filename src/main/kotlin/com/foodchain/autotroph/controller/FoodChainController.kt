@@ -125,6 +125,18 @@ fun Route.foodChainRoutes() {
                 }
             }
 
+            // POST /api/v1/food-chain/ingredients/bulk
+            post("/bulk") {
+                try {
+                    val request = call.receive<BulkCreateIngredientsRequest>()
+                    val response = foodChainService.createIngredientsBulk(request)
+                    call.respond(HttpStatusCode.Created, response)
+                } catch (e: Exception) {
+                    logger.error(e) { "Error creating ingredients in bulk" }
+                    call.respond(HttpStatusCode.BadRequest, ErrorResponse("CREATION_FAILED", e.message ?: "Failed to create ingredients"))
+                }
+            }
+
             // POST /api/v1/food-chain/ingredients/similar
             post("/similar") {
                 logger.info { "POST /api/v1/food-chain/ingredients/similar - Finding similar ingredients" }
@@ -201,6 +213,24 @@ fun Route.foodChainRoutes() {
                 }
             }
             
+            // POST /api/v1/food-chain/recipes/{id}/ingredients/bulk
+            post("/{id}/ingredients/bulk") {
+                val recipeId = call.parameters["id"]?.toLongOrNull()
+                if (recipeId == null) {
+                    call.respond(HttpStatusCode.BadRequest, ErrorResponse("INVALID_ID", "Invalid recipe ID"))
+                    return@post
+                }
+
+                try {
+                    val request = call.receive<BulkAddIngredientsToRecipeRequest>()
+                    val response = foodChainService.addIngredientsToRecipe(recipeId, request.ingredientIds)
+                    call.respond(HttpStatusCode.Created, response)
+                } catch (e: Exception) {
+                    logger.error(e) { "Error adding ingredients to recipe in bulk" }
+                    call.respond(HttpStatusCode.BadRequest, ErrorResponse("RELATIONSHIP_FAILED", e.message ?: "Failed to add ingredients to recipe"))
+                }
+            }
+            
             // POST /api/v1/food-chain/recipes/{id}/sub-recipes/{subRecipeId}
             post("/{id}/sub-recipes/{subRecipeId}") {
                 val parentRecipeId = call.parameters["id"]?.toLongOrNull()
@@ -201,6 +201,24 @@ data class BulkDeleteEntitiesRequest(
     val entityIds: List<Long>
 )
 
+@Serializable
+data class BulkCreateIngredientsRequest(
+    val ingredients: List<BulkIngredientItem>
+)
+
+@Serializable
+data class BulkIngredientItem(
+    val name: String,
+    val description: String? = null,
+    val purchaseFrequency: PurchaseFrequency? = null,
+    val storeLocationId: Long? = null // Store location to link the created ingredient to
+)
+
+@Serializable
+data class BulkAddIngredientsToRecipeRequest(
+    val ingredientIds: List<Long>
+)
+
 /**
  * Import/Export requests
  */
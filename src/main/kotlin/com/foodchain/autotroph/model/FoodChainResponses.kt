@@ -256,6 +256,29 @@ data class EntitySummary(
     val description: String?
 )
 
+/**
+ * Bulk operation response DTOs
+ */
+
+@Serializable
+data class BulkCreatedIngredient(
+    val id: Long,
+    val name: String,
+    val storeLocationId: Long? = null // Only set when the store location was linked successfully
+)
+
+@Serializable
+data class BulkCreateIngredientsResponse(
+    val ingredients: List<BulkCreatedIngredient>,
+    val failedNames: List<String> = emptyList()
+)
+
+@Serializable
+data class BulkRelationshipsResponse(
+    val created: Int,
+    val failedIds: List<Long> = emptyList()
+)
+
 /**
  * Aggregated response DTOs
  */
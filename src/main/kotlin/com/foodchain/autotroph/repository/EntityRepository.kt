@@ -232,11 +232,12 @@ class EntityRepository(private val driver: Driver) {
 
                 logger.info { "Creating relationship of type ${relationshipType.name} from $fromType($fromId) to $toType($toId)" }
 
-                // Create the relationship with the correct type
+                // Create the relationship with the correct type; MERGE makes
+                // repeated requests for the same relationship a no-op
                 val cypherQuery = """
                     MATCH (from:Entity), (to:Entity)
                     WHERE ID(from) = ${'$'}fromId AND ID(to) = ${'$'}toId
-                    CREATE (from)-[:${relationshipType.name}]->(to)
+                    MERGE (from)-[:${relationshipType.name}]->(to)
                     """.trimIndent()
 
                 logger.debug { "Executing Cypher query: $cypherQuery" }
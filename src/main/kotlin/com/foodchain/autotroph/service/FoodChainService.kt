@@ -96,6 +96,43 @@ class FoodChainService(
         return entityService.createRelationship(ingredientId, storeLocationId)
     }
 
+    suspend fun createIngredientsBulk(request: BulkCreateIngredientsRequest): BulkCreateIngredientsResponse {
+        logger.info { "Creating ${request.ingredients.size} ingredients in bulk" }
+
+        // A failing item (e.g. its embedding call) must not fail the items
+        // around it, which have already been created by then
+        val failedNames = mutableListOf<String>()
+        val created = request.ingredients.mapNotNull { item ->
+            val ingredient = try {
+                createIngredient(
+                    CreateIngredientRequest(
+                        name = item.name,
+                        description = item.description,
+                        purchaseFrequency = item.purchaseFrequency
+                    )
+                )
+            } catch (e: Exception) {
+                logger.error(e) { "Error creating ingredient '${item.name}' in bulk" }
+                failedNames.add(item.name)
+                return@mapNotNull null
+            }
+            val linkedStoreLocationId = item.storeLocationId?.takeIf {
+                addStoreLocationToIngredient(ingredient.id, it)
+            }
+
+            BulkCreatedIngredient(
+                id = ingredient.id,
+                name = ingredient.name,
+                storeLocationId = linkedStoreLocationId
+            )
+        }
+
+        return BulkCreateIngredientsResponse(
+            ingredients = created,
+            failedNames = failedNames
+        )
+    }
+
     suspend fun findSimilarIngredients(ingredientName: String, topK: Int = 10): List<SimilarIngredientResponse> {
         logger.info { "Finding similar ingredients for: '$ingredientName' (top $topK)" }
 
@@ -191,6 +228,16 @@ class FoodChainService(
         return entityService.createRelationship(recipeId, ingredientId)
     }
 
+    suspend fun addIngredientsToRecipe(recipeId: Long, ingredientIds: List<Long>): BulkRelationshipsResponse {
+        logger.info { "Adding ${ingredientIds.size} ingredients to recipe $recipeId" }
+
+        val failedIds = ingredientIds.filterNot { addIngredientToRecipe(recipeId, it) }
+        return BulkRelationshipsResponse(
+            created = ingredientIds.size - failedIds.size,
+            failedIds = failedIds
+        )
+    }
+
     suspend fun addSubRecipeToRecipe(parentRecipeId: Long, subRecipeId: Long): Boolean {
         logger.info { "Adding sub-recipe $subRecipeId to recipe $parentRecipeId" }
         return entityService.createRelationship(parentRecipeId, subRecipeId)
@@ -0,0 +1,157 @@
+package com.foodchain.autotroph.controller
+
+import com.foodchain.autotroph.config.configureRouting
+import com.foodchain.autotroph.config.configureSerialization
+import com.foodchain.autotroph.model.*
+import com.foodchain.autotroph.repository.EntityRepository
+import com.foodchain.autotroph.service.EmbeddingService
+import com.foodchain.autotroph.service.EntityService
+import com.foodchain.autotroph.service.FoodChainService
+import com.foodchain.autotroph.service.SchemaService
+import io.ktor.client.request.*
+import io.ktor.client.statement.*
+import io.ktor.http.*
+import io.ktor.server.testing.*
+import io.mockk.coEvery
+import io.mockk.coVerify
+import io.mockk.mockk
+import kotlinx.serialization.json.Json
+import org.kodein.di.bind
+import org.kodein.di.ktor.di
+import org.kodein.di.singleton
+import kotlin.test.Test
+import kotlin.test.assertEquals
+import kotlin.test.assertTrue
+
+class BulkImportEndpointTest {
+
+    @Test
+    fun `POST ingredients bulk should create all ingredients`() = testApplication {
+        // Setup mocks
+        val mockEntityRepository = mockk<EntityRepository>()
+        val mockEntityService = mockk<EntityService>()
+        val mockEmbeddingService = mockk<EmbeddingService>()
+        val mockFoodChainService = mockk<FoodChainService>()
+        val mockSchemaService = mockk<SchemaService>()
+
+        application {
+            di {
+                bind<EntityRepository>() with singleton { mockEntityRepository }
+                bind<EntityService>() with singleton { mockEntityService }
+                bind<EmbeddingService>() with singleton { mockEmbeddingService }
+                bind<FoodChainService>() with singleton { mockFoodChainService }
+                bind<SchemaService>() with singleton { mockSchemaService }
+            }
+            configureSerialization()
+            configureRouting()
+        }
+
+        // Mock the service response
+        val expectedRequest = BulkCreateIngredientsRequest(
+            ingredients = listOf(
+                BulkIngredientItem(name = "Garlic", purchaseFrequency = PurchaseFrequency.Usually, storeLocationId = 10L),
+                BulkIngredientItem(name = "Tahini", purchaseFrequency = PurchaseFrequency.Usually, storeLocationId = 11L)
+            )
+        )
+        coEvery { mockFoodChainService.createIngredientsBulk(expectedRequest) } returns BulkCreateIngredientsResponse(
+            ingredients = listOf(
+                BulkCreatedIngredient(id = 1L, name = "Garlic", storeLocationId = 10L),
+                BulkCreatedIngredient(id = 2L, name = "Tahini", storeLocationId = 11L)
+            )
+        )
+
+        // Make the request
+        val response = client.post("/api/v1/food-chain/ingredients/bulk") {
+            contentType(ContentType.Application.Json)
+            setBody(
+                """{"ingredients": [
+                    {"name": "Garlic", "purchaseFrequency": "Usually", "storeLocationId": 10},
+                    {"name": "Tahini", "purchaseFrequency": "Usually", "storeLocationId": 11}
+                ]}"""
+            )
+        }
+
+        // Verify response
+        assertEquals(HttpStatusCode.Created, response.status)
+
+        val responseBody = response.bodyAsText()
+        assertTrue(responseBody.contains("Garlic"))
+        assertTrue(responseBody.contains("Tahini"))
+        coVerify(exactly = 1) { mockFoodChainService.createIngredientsBulk(expectedRequest) }
+    }
+
+    @Test
+    fun `POST recipe ingredients bulk should link all ingredients`() = testApplication {
+        // Setup mocks
+        val mockEntityRepository = mockk<EntityRepository>()
+        val mockEntityService = mockk<EntityService>()
+        val mockEmbeddingService = mockk<EmbeddingService>()
+        val mockFoodChainService = mockk<FoodChainService>()
+        val mockSchemaService = mockk<SchemaService>()
+
+        application {
+            di {
+                bind<EntityRepository>() with singleton { mockEntityRepository }
+                bind<EntityService>() with singleton { mockEntityService }
+                bind<EmbeddingService>() with singleton { mockEmbeddingService }
+                bind<FoodChainService>() with singleton { mockFoodChainService }
+                bind<SchemaService>() with singleton { mockSchemaService }
+            }
+            configureSerialization()
+            configureRouting()
+        }
+
+        // Mock a partial failure
+        coEvery { mockFoodChainService.addIngredientsToRecipe(5L, listOf(1L, 2L, 3L)) } returns BulkRelationshipsResponse(
+            created = 2,
+            failedIds = listOf(3L)
+        )
+
+        // Make the request
+        val response = client.post("/api/v1/food-chain/recipes/5/ingredients/bulk") {
+            contentType(ContentType.Application.Json)
+            setBody("""{"ingredientIds": [1, 2, 3]}""")
+        }
+
+        // Verify response
+        assertEquals(HttpStatusCode.Created, response.status)
+
+        val responseBody = Json.decodeFromString<BulkRelationshipsResponse>(response.bodyAsText())
+        assertEquals(2, responseBody.created)
+        assertEquals(listOf(3L), responseBody.failedIds)
+    }
+
+    @Test
+    fun `POST recipe ingredients bulk should return 400 for invalid recipe id`() = testApplication {
+        // Setup mocks
+        val mockEntityRepository = mockk<EntityRepository>()
+        val mockEntityService = mockk<EntityService>()
+        val mockEmbeddingService = mockk<EmbeddingService>()
+        val mockFoodChainService = mockk<FoodChainService>()
+        val mockSchemaService = mockk<SchemaService>()
+
+        application {
+            di {
+                bind<EntityRepository>() with singleton { mockEntityRepository }
+                bind<EntityService>() with singleton { mockEntityService }
+                bind<EmbeddingService>() with singleton { mockEmbeddingService }
+                bind<FoodChainService>() with singleton { mockFoodChainService }
+                bind<SchemaService>() with singleton { mockSchemaService }
+            }
+            configureSerialization()
+            configureRouting()
+        }
+
+        // Make the request with a non-numeric recipe id
+        val response = client.post("/api/v1/food-chain/recipes/abc/ingredients/bulk") {
+            contentType(ContentType.Application.Json)
+            setBody("""{"ingredientIds": [1]}""")
+        }
+
+        // Verify response
+        assertEquals(HttpStatusCode.BadRequest, response.status)
+
+        val responseBody = response.bodyAsText()
+        assertTrue(responseBody.contains("INVALID_ID"))
+    }
+}
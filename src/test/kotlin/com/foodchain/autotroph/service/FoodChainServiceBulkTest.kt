@@ -0,0 +1,115 @@
+package com.foodchain.autotroph.service
+
+import com.foodchain.autotroph.model.*
+import com.foodchain.autotroph.repository.EntityRepository
+import io.mockk.coEvery
+import io.mockk.coVerify
+import io.mockk.mockk
+import kotlinx.coroutines.runBlocking
+import kotlinx.datetime.Clock
+import kotlin.test.Test
+import kotlin.test.assertEquals
+
+class FoodChainServiceBulkTest {
+
+    private val entityRepository = mockk<EntityRepository>()
+    private val entityService = mockk<EntityService>()
+    private val embeddingService = mockk<EmbeddingService>()
+
+    private val foodChainService = FoodChainService(
+        entityRepository = entityRepository,
+        entityService = entityService,
+        embeddingService = embeddingService
+    )
+
+    private fun ingredientEntity(id: Long, name: String) = EntityResponse(
+        id = id,
+        name = name,
+        type = "Ingredient",
+        description = null,
+        createdAt = Clock.System.now(),
+        updatedAt = Clock.System.now(),
+        properties = emptyMap(),
+        relatedEntitiesCount = 0
+    )
+
+    @Test
+    fun `createIngredientsBulk should create and link each ingredient`() = runBlocking {
+        // Given
+        coEvery { embeddingService.generateEmbedding(any()) } returns listOf(0.1, 0.2)
+        coEvery { entityService.createEntity(match { it.name == "Garlic" }) } returns ingredientEntity(1L, "Garlic")
+        coEvery { entityService.createEntity(match { it.name == "Tahini" }) } returns ingredientEntity(2L, "Tahini")
+        coEvery { entityService.createRelationship(1L, 10L) } returns true
+        coEvery { entityService.createRelationship(2L, 11L) } returns true
+
+        val request = BulkCreateIngredientsRequest(
+            ingredients = listOf(
+                BulkIngredientItem(name = "Garlic", storeLocationId = 10L),
+                BulkIngredientItem(name = "Tahini", storeLocationId = 11L)
+            )
+        )
+
+        // When
+        val result = foodChainService.createIngredientsBulk(request)
+
+        // Then
+        assertEquals(
+            listOf(
+                BulkCreatedIngredient(id = 1L, name = "Garlic", storeLocationId = 10L),
+                BulkCreatedIngredient(id = 2L, name = "Tahini", storeLocationId = 11L)
+            ),
+            result.ingredients
+        )
+        assertEquals(emptyList<String>(), result.failedNames)
+    }
+
+    @Test
+    fun `createIngredientsBulk should report a failing item without failing the others`() = runBlocking {
+        // Given
+        coEvery { embeddingService.generateEmbedding("Garlic") } returns listOf(0.1, 0.2)
+        coEvery { embeddingService.generateEmbedding("Tahini") } throws RuntimeException("Embedding API unavailable")
+        coEvery { embeddingService.generateEmbedding("Lemon") } returns listOf(0.3, 0.4)
+        coEvery { entityService.createEntity(match { it.name == "Garlic" }) } returns ingredientEntity(1L, "Garlic")
+        coEvery { entityService.createEntity(match { it.name == "Lemon" }) } returns ingredientEntity(3L, "Lemon")
+        coEvery { entityService.createRelationship(1L, 10L) } returns true
+        coEvery { entityService.createRelationship(3L, 10L) } returns false
+
+        val request = BulkCreateIngredientsRequest(
+            ingredients = listOf(
+                BulkIngredientItem(name = "Garlic", storeLocationId = 10L),
+                BulkIngredientItem(name = "Tahini", storeLocationId = 10L),
+                BulkIngredientItem(name = "Lemon", storeLocationId = 10L)
+            )
+        )
+
+        // When
+        val result = foodChainService.createIngredientsBulk(request)
+
+        // Then
+        // The failed link leaves Lemon without a store location ID
+        assertEquals(
+            listOf(
+                BulkCreatedIngredient(id = 1L, name = "Garlic", storeLocationId = 10L),
+                BulkCreatedIngredient(id = 3L, name = "Lemon", storeLocationId = null)
+            ),
+            result.ingredients
+        )
+        assertEquals(listOf("Tahini"), result.failedNames)
+        coVerify(exactly = 0) { entityService.createEntity(match { it.name == "Tahini" }) }
+    }
+
+    @Test
+    fun `addIngredientsToRecipe should report the ingredients that failed to link`() = runBlocking {
+        // Given
+        coEvery { entityService.createRelationship(5L, 1L) } returns true
+        coEvery { entityService.createRelationship(5L, 2L) } returns false
+        coEvery { entityService.createRelationship(5L, 3L) } returns true
+
+        // When
+        val result = foodChainService.addIngredientsToRecipe(5L, listOf(1L, 2L, 3L))
+
+        // Then
+        assertEquals(2, result.created)
+        assertEquals(listOf(2L), result.failedIds)
+    }
+}
@@ -0,0 +1,358 @@
+#!/usr/bin/env python3
+"""
+Tests for import_groceries.py, run against a local HTTP server.
+
+Usage: python -m unittest test_import_groceries
+"""
+
+import json
+import os
+import tempfile
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from import_groceries import FoodChainImporter
+
+class SlowHandler(BaseHTTPRequestHandler):
+    """Answers the first slow_requests requests only after the server's delay has passed"""
+
+    def _respond(self):
+        self.server.requests_seen += 1
+        if self.server.requests_seen <= self.server.slow_requests:
+            time.sleep(self.server.delay)
+        try:
+            self.send_response(201)
+            self.send_header('Content-Type', 'application/json')
+            self.end_headers()
+            self.wfile.write(b'{"id": 1}')
+        except OSError:
+            pass  # The client gave up waiting
+
+    do_GET = _respond
+    do_POST = _respond
+
+    def log_message(self, format, *args):
+        pass
+
+class JsonHandler(BaseHTTPRequestHandler):
+    """Base for handlers that answer with JSON bodies"""
+
+    def _send_json(self, status, body):
+        payload = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+class StatusHandler(JsonHandler):
+    """Answers with the server's queued statuses first, then with 201 Created"""
+
+    def _respond(self):
+        self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        self.server.requests_seen += 1
+        if self.server.statuses:
+            self._send_json(self.server.statuses.pop(0), {"error": "UNAVAILABLE"})
+        else:
+            self._send_json(201, {"id": 1})
+
+    do_GET = _respond
+    do_POST = _respond
+
+class ConflictHandler(JsonHandler):
+    """Answers every create with 409 Conflict and searches by name from the server's entities"""
+
+    def do_GET(self):
+        name = parse_qs(urlparse(self.path).query).get('name', [None])[0]
+        self._send_json(200, [entity for entity in self.server.entities if entity['name'] == name])
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        self._send_json(409, {"error": "ALREADY_EXISTS", "message": "Entity already exists"})
+
+class ExistingDataHandler(JsonHandler):
+    """Serves the server's entities from the type search and records every POST"""
+
+    def do_GET(self):
+        entity_type = parse_qs(urlparse(self.path).query).get('type', [None])[0]
+        if entity_type in self.server.unavailable_types:
+            self._send_json(404, {"error": "NOT_FOUND"})
+            return
+        self._send_json(200, [entity for entity in self.server.entities if entity['type'] == entity_type])
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        self.server.posted.append(self.path)
+        if self.path.endswith('/ingredients/bulk'):
+            self._send_json(201, {"created": 1, "failedIds": self.server.failed_ids})
+        else:
+            self._send_json(201, {"message": "Store location added to ingredient"})
+
+class MalformedBulkHandler(JsonHandler):
+    """Creates store locations and recipes but answers bulk ingredient creates without IDs"""
+
+    def do_GET(self):
+        self._send_json(200, [])
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'null')
+        if self.path.endswith('/ingredients/bulk') and 'ingredients' in body:
+            self._send_json(201, {"ingredients": [{"name": item['name']} for item in body['ingredients']]})
+        elif self.path.endswith('/ingredients/bulk'):
+            self._send_json(201, {"created": len(body['ingredientIds'])})
+        else:
+            self._send_json(201, {"id": 7, "name": body['name']})
+
+class MakeRequestTimeoutTest(unittest.TestCase):
+
+    def setUp(self):
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), SlowHandler)
+        self.server.delay = 0.5
+        self.server.slow_requests = float('inf')
+        self.server.requests_seen = 0
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.importer = FoodChainImporter(f'http://127.0.0.1:{self.server.server_port}', read_timeout=0.1)
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_read_timeout_on_post_is_counted(self):
+        result = self.importer.make_request('POST', '/api/v1/food-chain/recipes', {"name": "Babaganoosh"})
+
+        self.assertIsNone(result)
+        self.assertEqual(1, self.importer.timed_out_requests)
+
+    def test_read_timeout_on_post_is_not_retried(self):
+        self.importer.make_request('POST', '/api/v1/food-chain/ingredients/bulk', {"ingredients": []})
+
+        # The server may still create the entities, so re-sending would duplicate them
+        self.assertEqual(1, self.server.requests_seen)
+
+    def test_read_timeout_on_get_is_retried(self):
+        self.server.slow_requests = 1
+
+        result = self.importer.make_request('GET', '/api/v1/entities/search?type=Recipe')
+
+        self.assertEqual({"id": 1}, result)
+        self.assertEqual(2, self.server.requests_seen)
+        self.assertEqual(0, self.importer.timed_out_requests)
+
+    def test_read_timeout_on_get_is_counted_once_retries_run_out(self):
+        result = self.importer.make_request('GET', '/api/v1/entities/search?type=Recipe')
+
+        self.assertIsNone(result)
+        self.assertEqual(1, self.importer.timed_out_requests)
+
+    def test_bulk_ingredients_get_a_longer_read_timeout(self):
+        self.importer.create_ingredients_bulk({"Garlic": 7, "Tahini": 7})
+
+        self.assertEqual(1, self.server.requests_seen)
+        self.assertEqual(0, self.importer.timed_out_requests)
+
+    def test_response_within_timeout_is_not_counted(self):
+        self.server.delay = 0
+
+        result = self.importer.make_request('POST', '/api/v1/food-chain/recipes', {"name": "Babaganoosh"})
+
+        self.assertEqual({"id": 1}, result)
+        self.assertEqual(0, self.importer.timed_out_requests)
+
+class SingleFlightTest(unittest.TestCase):
+
+    def setUp(self):
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), SlowHandler)
+        self.server.delay = 0.3
+        self.server.slow_requests = float('inf')
+        self.server.requests_seen = 0
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.importer = FoodChainImporter(f'http://127.0.0.1:{self.server.server_port}')
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_concurrent_creates_of_the_same_store_location_post_once(self):
+        start = threading.Barrier(2)
+        location_ids = []
+
+        def create():
+            start.wait()
+            location_ids.append(self.importer.create_store_location("Produce"))
+
+        threads = [threading.Thread(target=create) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(1, self.server.requests_seen)
+        self.assertEqual([1, 1], location_ids)
+
+class PlanTest(unittest.TestCase):
+
+    def test_plan_deduplicates_entities(self):
+        recipes_in = [
+            {"name": "Babaganoosh", "items": [{"name": "Eggplant", "category": "Produce"},
+                                              {"name": "Tahini", "category": "Middle"}]},
+            {"name": "Hummus", "items": [{"name": "Tahini", "category": "Deli"},
+                                         {"name": "Salt", "category": None}]},
+            {"name": "Babaganoosh", "items": [{"name": "Garlic", "category": "Produce"}]},
+        ]
+
+        categories, items, recipes = FoodChainImporter()._plan(recipes_in)
+
+        self.assertEqual(["Produce", "Middle", ""], categories)
+        # The first category seen for an ingredient wins
+        self.assertEqual({"Eggplant": "Produce", "Tahini": "Middle", "Salt": ""}, items)
+        # A recipe seen again is skipped
+        self.assertEqual([("Babaganoosh", ["Eggplant", "Tahini"]), ("Hummus", ["Tahini", "Salt"])], recipes)
+
+class StatusRetryTest(unittest.TestCase):
+
+    def setUp(self):
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), StatusHandler)
+        self.server.requests_seen = 0
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.importer = FoodChainImporter(f'http://127.0.0.1:{self.server.server_port}')
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_rejected_post_is_retried(self):
+        self.server.statuses = [503, 429]
+
+        result = self.importer.make_request('POST', '/api/v1/food-chain/recipes', {"name": "Babaganoosh"})
+
+        self.assertEqual({"id": 1}, result)
+        self.assertEqual(3, self.server.requests_seen)
+
+    def test_post_behind_failing_gateway_is_not_retried(self):
+        self.server.statuses = [502]
+
+        result = self.importer.make_request('POST', '/api/v1/food-chain/recipes', {"name": "Babaganoosh"})
+
+        # The service behind the gateway may still have created the recipe
+        self.assertIsNone(result)
+        self.assertEqual(1, self.server.requests_seen)
+
+    def test_get_behind_failing_gateway_is_retried(self):
+        self.server.statuses = [502]
+
+        result = self.importer.make_request('GET', '/api/v1/entities/search?type=Recipe')
+
+        self.assertEqual({"id": 1}, result)
+        self.assertEqual(2, self.server.requests_seen)
+
+class AlreadyExistsTest(unittest.TestCase):
+
+    def setUp(self):
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), ConflictHandler)
+        self.server.entities = [
+            {"id": 7, "name": "Produce Section", "type": "StoreLocation"},
+            {"id": 8, "name": "Babaganoosh & Pita", "type": "Ingredient"},
+            {"id": 9, "name": "Babaganoosh & Pita", "type": "Recipe"},
+        ]
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.importer = FoodChainImporter(f'http://127.0.0.1:{self.server.server_port}')
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_existing_store_location_is_reused(self):
+        self.assertEqual(7, self.importer.create_store_location("Produce"))
+
+    def test_existing_recipe_is_reused(self):
+        self.assertEqual(9, self.importer.create_recipe("Babaganoosh & Pita"))
+
+    def test_existing_entity_that_cannot_be_found_fails(self):
+        self.assertIsNone(self.importer.create_recipe("Hummus"))
+
+class RerunTest(unittest.TestCase):
+
+    def setUp(self):
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), ExistingDataHandler)
+        self.server.posted = []
+        self.server.failed_ids = []
+        self.server.unavailable_types = ()
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.importer = FoodChainImporter(f'http://127.0.0.1:{self.server.server_port}')
+
+        with tempfile.NamedTemporaryFile('w', suffix='.json', delete=False) as f:
+            json.dump({"recipes": [{"name": "Babaganoosh", "items": [{"name": "Eggplant", "category": "Produce"}]}]}, f)
+        self.json_file_path = f.name
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        os.remove(self.json_file_path)
+
+    def _existing_entities(self, ingredient_links):
+        return [
+            {"id": 7, "name": "Produce Section", "type": "StoreLocation", "relatedEntitiesCount": 0},
+            {"id": 8, "name": "Eggplant", "type": "Ingredient", "relatedEntitiesCount": ingredient_links},
+            {"id": 9, "name": "Babaganoosh", "type": "Recipe", "relatedEntitiesCount": 1},
+        ]
+
+    def test_unlinked_ingredient_is_linked_to_its_store_location(self):
+        self.server.entities = self._existing_entities(ingredient_links=0)
+
+        self.assertTrue(self.importer.import_data(self.json_file_path))
+
+        self.assertEqual(['/api/v1/food-chain/ingredients/8/store-locations/7',
+                          '/api/v1/food-chain/recipes/9/ingredients/bulk'], self.server.posted)
+
+    def test_linked_ingredient_is_left_alone(self):
+        self.server.entities = self._existing_entities(ingredient_links=1)
+
+        self.assertTrue(self.importer.import_data(self.json_file_path))
+
+        self.assertEqual(['/api/v1/food-chain/recipes/9/ingredients/bulk'], self.server.posted)
+
+    def test_import_is_aborted_when_existing_entities_cannot_be_fetched(self):
+        self.server.entities = self._existing_entities(ingredient_links=1)
+        self.server.unavailable_types = ('Ingredient',)
+
+        self.assertFalse(self.importer.import_data(self.json_file_path))
+
+        # Nothing is created again
+        self.assertEqual([], self.server.posted)
+
+    def test_failed_recipe_link_fails_the_import(self):
+        self.server.entities = self._existing_entities(ingredient_links=1)
+        self.server.failed_ids = [8]
+
+        self.assertFalse(self.importer.import_data(self.json_file_path))
+        self.assertEqual(1, self.importer.failed_relationships)
+
+class MalformedResponseTest(unittest.TestCase):
+
+    def setUp(self):
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), MalformedBulkHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.importer = FoodChainImporter(f'http://127.0.0.1:{self.server.server_port}')
+
+        with tempfile.NamedTemporaryFile('w', suffix='.json', delete=False) as f:
+            json.dump({"recipes": [{"name": "Babaganoosh", "items": [{"name": "Eggplant", "category": "Produce"}]}]}, f)
+        self.json_file_path = f.name
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        os.remove(self.json_file_path)
+
+    def test_error_in_ingredient_batch_fails_the_import_without_raising(self):
+        self.assertFalse(self.importer.import_data(self.json_file_path))
+
+        self.assertEqual(1, self.importer.failed_ingredients)
+
+if __name__ == '__main__':
+    unittest.main()